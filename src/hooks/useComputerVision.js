@@ -4,6 +4,60 @@ import '@tensorflow/tfjs-core';
 import '@tensorflow/tfjs-converter';
 import '@tensorflow/tfjs-backend-webgl';
 
+// MediaPipe Face Mesh keypoints are indexed 0-467
+const MIN_KEYPOINTS = 468;
+const NOSE_TIP_IDX = 1;
+const UPPER_LIP_IDX = 13;
+const LOWER_LIP_IDX = 14;
+
+// Gaze history: last 2 seconds of nose positions (~30fps = 60 frames),
+// of which the most recent 30 are used for the stability estimate
+const GAZE_HISTORY_SIZE = 60;
+const GAZE_WINDOW_SIZE = 30;
+
+// Fixed-size circular buffer so per-frame updates never allocate or shift
+const createGazeHistory = () => ({
+  x: new Float32Array(GAZE_HISTORY_SIZE),
+  y: new Float32Array(GAZE_HISTORY_SIZE),
+  next: 0,
+  count: 0
+});
+
+// Breathing history: last 10 seconds of nose-to-mouth distances. The loop's
+// frame rate isn't bounded (requestAnimationFrame can run at 120-144 Hz), so the
+// ring starts sized for 10 seconds at 144 fps and doubles whenever it fills
+// rather than dropping samples that are still inside the window.
+const BREATHING_WINDOW_MS = 10000;
+const BREATHING_INITIAL_CAPACITY = Math.ceil(BREATHING_WINDOW_MS / 1000 * 144) + 60;
+// Samples are recorded every frame, but the rate estimate is only refreshed this often
+const BREATHING_UPDATE_INTERVAL_MS = 1000;
+
+// Parallel distance/timestamp arrays instead of one object per frame, sized by
+// the caller so growBreathingHistory can reuse it. Distances fit comfortably in
+// float32; epoch-millisecond timestamps need float64.
+const createBreathingHistory = (capacity = BREATHING_INITIAL_CAPACITY) => ({
+  distance: new Float32Array(capacity),
+  timestamp: new Float64Array(capacity),
+  start: 0,
+  count: 0
+});
+
+// Copy a full ring into one twice as large, unwrapping it so start is 0
+const growBreathingHistory = (history) => {
+  const capacity = history.timestamp.length;
+  const grown = createBreathingHistory(capacity * 2);
+  for (let i = 0; i < history.count; i++) {
+    const idx = (history.start + i) % capacity;
+    grown.distance[i] = history.distance[idx];
+    grown.timestamp[i] = history.timestamp[idx];
+  }
+  grown.count = history.count;
+  return grown;
+};
+
+// Passed to estimateFaces on every frame, so build it once
+const ESTIMATE_FACES_CONFIG = { flipHorizontal: false };
+
 export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
   const [eyeContact, setEyeContact] = useState(0);
   const [gazeStability, setGazeStability] = useState(100);
@@ -11,8 +65,10 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
 
   const detectorRef = useRef(null);
   const previousLandmarksRef = useRef([]);
-  const breathingHistoryRef = useRef([]);
-  const gazeHistoryRef = useRef([]);
+  const breathingHistoryRef = useRef(null);
+  const breathingRateRef = useRef(14);
+  const lastBreathingUpdateRef = useRef(0);
+  const gazeHistoryRef = useRef(null);
   const animationFrameRef = useRef(null);
   const canvasRef = useRef(null);
 
@@ -65,11 +121,14 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
 
     console.log('🎬 Starting face detection processing loop...');
     let frameCount = 0;
+    let lastVideoTime = -1;
 
     // Create canvas for processing
     if (!canvasRef.current) {
       canvasRef.current = document.createElement('canvas');
     }
+    // The 2D context survives canvas resizes, so look it up once per loop
+    const ctx = canvasRef.current.getContext('2d');
 
     const processFrame = async () => {
       if (!videoRef.current || videoRef.current.readyState < 2) {
@@ -77,6 +136,16 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
         return;
       }
 
+      // requestAnimationFrame fires at the display refresh rate, which is usually
+      // faster than the camera. Skip ticks where the media clock hasn't advanced,
+      // which avoids most re-processing of the same frame. This is best effort:
+      // currentTime can move without a new camera frame being decoded.
+      if (videoRef.current.currentTime === lastVideoTime) {
+        animationFrameRef.current = requestAnimationFrame(processFrame);
+        return;
+      }
+      lastVideoTime = videoRef.current.currentTime;
+
       try {
         frameCount++;
         const video = videoRef.current;
@@ -93,10 +162,15 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
         }
 
         // Draw video to canvas for better compatibility
+        // Only resize when the video dimensions change: assigning width/height
+        // reallocates and clears the canvas backing store even if unchanged
         const canvas = canvasRef.current;
-        canvas.width = video.videoWidth || 640;
-        canvas.height = video.videoHeight || 480;
-        const ctx = canvas.getContext('2d');
+        const width = video.videoWidth || 640;
+        const height = video.videoHeight || 480;
+        if (canvas.width !== width || canvas.height !== height) {
+          canvas.width = width;
+          canvas.height = height;
+        }
         ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
 
         // Check if we're getting actual video data (not just green/black screen)
@@ -124,9 +198,7 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
         }
 
         // Use canvas instead of video element for detection
-        const faces = await detectorRef.current.estimateFaces(canvas, {
-          flipHorizontal: false
-        });
+        const faces = await detectorRef.current.estimateFaces(canvas, ESTIMATE_FACES_CONFIG);
 
         if (frameCount % 30 === 0) {
           console.log(`Frame ${frameCount}: Detected ${faces?.length || 0} faces`);
@@ -186,14 +258,12 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
   // Calculate eye contact based on eye landmarks
   const calculateEyeContact = (keypoints) => {
     try {
-      if (!keypoints || keypoints.length < 468) {
+      if (!keypoints || keypoints.length < MIN_KEYPOINTS) {
         console.log('Insufficient keypoints for eye contact calculation');
         return eyeContact;
       }
 
-      // MediaPipe Face Mesh keypoints are indexed 0-467
-      // Nose tip is index 1
-      const noseTip = keypoints[1];
+      const noseTip = keypoints[NOSE_TIP_IDX];
 
       if (!noseTip || !videoRef.current) {
         return eyeContact;
@@ -226,37 +296,52 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
   // Calculate gaze stability based on eye movement
   const calculateGazeStability = (keypoints) => {
     try {
-      if (!keypoints || keypoints.length < 468) {
+      if (!keypoints || keypoints.length < MIN_KEYPOINTS) {
         return gazeStability;
       }
 
-      const noseTip = keypoints[1]; // Nose tip index
+      const noseTip = keypoints[NOSE_TIP_IDX];
 
       if (!noseTip) return gazeStability;
 
-      // Add current position to history
-      gazeHistoryRef.current.push({ x: noseTip.x, y: noseTip.y, timestamp: Date.now() });
-
-      // Keep only last 2 seconds of data (assuming ~30fps = 60 frames)
-      if (gazeHistoryRef.current.length > 60) {
-        gazeHistoryRef.current.shift();
+      if (!gazeHistoryRef.current) {
+        gazeHistoryRef.current = createGazeHistory();
       }
+      const history = gazeHistoryRef.current;
+
+      // Add current position to history, overwriting the oldest sample
+      history.x[history.next] = noseTip.x;
+      history.y[history.next] = noseTip.y;
+      history.next = (history.next + 1) % GAZE_HISTORY_SIZE;
+      history.count = Math.min(history.count + 1, GAZE_HISTORY_SIZE);
 
       // Calculate movement variance
-      if (gazeHistoryRef.current.length < 10) {
+      if (history.count < 10) {
         return 85; // Default value for insufficient data
       }
 
-      const positions = gazeHistoryRef.current.slice(-30);
-      const avgX = positions.reduce((sum, p) => sum + p.x, 0) / positions.length;
-      const avgY = positions.reduce((sum, p) => sum + p.y, 0) / positions.length;
+      // Walk the most recent samples in place, accumulating both axes in a single pass
+      const count = Math.min(history.count, GAZE_WINDOW_SIZE);
+      const start = history.next - count + GAZE_HISTORY_SIZE;
+      let sumX = 0;
+      let sumY = 0;
+      for (let i = 0; i < count; i++) {
+        const idx = (start + i) % GAZE_HISTORY_SIZE;
+        sumX += history.x[idx];
+        sumY += history.y[idx];
+      }
+      const avgX = sumX / count;
+      const avgY = sumY / count;
 
       // Calculate variance (how much the gaze moves)
-      const variance = positions.reduce((sum, p) => {
-        const dx = p.x - avgX;
-        const dy = p.y - avgY;
-        return sum + Math.sqrt(dx * dx + dy * dy);
-      }, 0) / positions.length;
+      let totalDeviation = 0;
+      for (let i = 0; i < count; i++) {
+        const idx = (start + i) % GAZE_HISTORY_SIZE;
+        const dx = history.x[idx] - avgX;
+        const dy = history.y[idx] - avgY;
+        totalDeviation += Math.sqrt(dx * dx + dy * dy);
+      }
+      const variance = totalDeviation / count;
 
       // Convert variance to stability percentage
       // Lower variance = higher stability
@@ -272,15 +357,14 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
   // Calculate breathing rate from subtle facial movements
   const calculateBreathing = (keypoints) => {
     try {
-      if (!keypoints || keypoints.length < 468) {
+      if (!keypoints || keypoints.length < MIN_KEYPOINTS) {
         return breathingRate;
       }
 
       // Use nose and mouth landmarks to detect breathing
-      // MediaPipe Face Mesh indices: nose tip (1), upper lip (13), lower lip (14)
-      const noseTip = keypoints[1];
-      const upperLip = keypoints[13];
-      const lowerLip = keypoints[14];
+      const noseTip = keypoints[NOSE_TIP_IDX];
+      const upperLip = keypoints[UPPER_LIP_IDX];
+      const lowerLip = keypoints[LOWER_LIP_IDX];
 
       if (!noseTip || !upperLip || !lowerLip) {
         return breathingRate;
@@ -292,32 +376,55 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
         Math.pow(noseTip.y - upperLip.y, 2)
       );
 
+      if (!breathingHistoryRef.current) {
+        breathingHistoryRef.current = createBreathingHistory();
+      }
+      if (breathingHistoryRef.current.count === breathingHistoryRef.current.timestamp.length) {
+        breathingHistoryRef.current = growBreathingHistory(breathingHistoryRef.current);
+      }
+      const history = breathingHistoryRef.current;
+      const capacity = history.timestamp.length;
+
       // Add to breathing history with timestamp
       const now = Date.now();
-      breathingHistoryRef.current.push({
-        distance: noseToMouthDist,
-        timestamp: now
-      });
-
-      // Keep only last 10 seconds of data
-      breathingHistoryRef.current = breathingHistoryRef.current.filter(
-        h => now - h.timestamp < 10000
-      );
+      const writeIdx = (history.start + history.count) % capacity;
+      history.distance[writeIdx] = noseToMouthDist;
+      history.timestamp[writeIdx] = now;
+      history.count++;
+
+      // Keep only last 10 seconds of data. Timestamps are appended in order,
+      // so expired samples are always at the front of the ring.
+      while (history.count > 0 && now - history.timestamp[history.start] >= BREATHING_WINDOW_MS) {
+        history.start = (history.start + 1) % capacity;
+        history.count--;
+      }
+
+      // The estimate below walks the whole 10 second window; between refreshes
+      // reuse the last value instead of re-running it on every frame
+      if (now - lastBreathingUpdateRef.current < BREATHING_UPDATE_INTERVAL_MS) {
+        return breathingRateRef.current;
+      }
+      lastBreathingUpdateRef.current = now;
 
       // Need at least 5 seconds of data to calculate breathing rate
-      if (breathingHistoryRef.current.length < 50) {
-        return 14; // Default breathing rate
+      if (history.count < 50) {
+        breathingRateRef.current = 14; // Default breathing rate
+        return breathingRateRef.current;
       }
 
       // Detect peaks (inhalation cycles)
-      const distances = breathingHistoryRef.current.map(h => h.distance);
-      const avg = distances.reduce((a, b) => a + b, 0) / distances.length;
+      let sum = 0;
+      for (let i = 0; i < history.count; i++) {
+        sum += history.distance[(history.start + i) % capacity];
+      }
+      const avg = sum / history.count;
       const threshold = avg * 1.02; // 2% above average
 
       let peaks = 0;
       let wasAbove = false;
 
-      for (const dist of distances) {
+      for (let i = 0; i < history.count; i++) {
+        const dist = history.distance[(history.start + i) % capacity];
         if (dist > threshold && !wasAbove) {
           peaks++;
           wasAbove = true;
@@ -327,13 +434,14 @@ export const useComputerVision = (videoRef, sessionActive, sessionPaused) => {
       }
 
       // Calculate breaths per minute
-      const duration = (now - breathingHistoryRef.current[0].timestamp) / 1000; // in seconds
+      const duration = (now - history.timestamp[history.start]) / 1000; // in seconds
       const breathsPerMinute = (peaks / duration) * 60;
 
       // Clamp to realistic range (8-30 breaths per minute)
       const clampedRate = Math.max(8, Math.min(30, breathsPerMinute));
 
-      return Math.round(clampedRate * 10) / 10; // Round to 1 decimal place
+      breathingRateRef.current = Math.round(clampedRate * 10) / 10; // Round to 1 decimal place
+      return breathingRateRef.current;
     } catch (error) {
       console.error('Error calculating breathing:', error);
       return breathingRate;
@@ -1,6 +1,12 @@
 import { useEffect, useRef, useState } from 'react';
 import * as faceapi from '@vladmandic/face-api';
 
+// Use more sensitive detection options (built once and reused for every detection)
+const DETECTOR_OPTIONS = new faceapi.TinyFaceDetectorOptions({
+  inputSize: 416,  // Larger = more accurate (128, 224, 320, 416, 512, 608)
+  scoreThreshold: 0.4  // Lower = more sensitive (0-1)
+});
+
 export const useEmotionDetection = (videoRef, sessionActive, sessionPaused) => {
   const [currentEmotion, setCurrentEmotion] = useState('neutral');
   const [emotionConfidence, setEmotionConfidence] = useState(0);
@@ -9,6 +15,7 @@ export const useEmotionDetection = (videoRef, sessionActive, sessionPaused) => {
   const detectionIntervalRef = useRef(null);
   const initialTimeoutRef = useRef(null);
   const canvasRef = useRef(null);
+  const detectionInFlightRef = useRef(false);
 
   // Load face-api.js models from CDN
   useEffect(() => {
@@ -79,6 +86,12 @@ export const useEmotionDetection = (videoRef, sessionActive, sessionPaused) => {
         return;
       }
 
+      // Drop this tick if the previous detection hasn't finished yet, rather
+      // than queueing overlapping inference calls behind a slow frame
+      if (detectionInFlightRef.current) {
+        return;
+      }
+
       // Wait for video to be ready with actual frames
       const readyState = videoRef.current.readyState;
       if (readyState < 2) {
@@ -92,6 +105,7 @@ export const useEmotionDetection = (videoRef, sessionActive, sessionPaused) => {
         return;
       }
 
+      detectionInFlightRef.current = true;
       try {
         // Double-check models are loaded
         if (!faceapi.nets.tinyFaceDetector.isLoaded || !faceapi.nets.faceExpressionNet.isLoaded) {
@@ -105,8 +119,10 @@ export const useEmotionDetection = (videoRef, sessionActive, sessionPaused) => {
 
         const canvas = canvasRef.current;
         const video = videoRef.current;
-        canvas.width = video.videoWidth;
-        canvas.height = video.videoHeight;
+        if (canvas.width !== width || canvas.height !== height) {
+          canvas.width = width;
+          canvas.height = height;
+        }
 
         const ctx = canvas.getContext('2d');
         // Draw video frame to canvas (undo the mirror transform for detection)
@@ -115,26 +131,24 @@ export const useEmotionDetection = (videoRef, sessionActive, sessionPaused) => {
         ctx.drawImage(video, -canvas.width, 0, canvas.width, canvas.height);
         ctx.restore();
 
-        // Use more sensitive detection options
-        const options = new faceapi.TinyFaceDetectorOptions({
-          inputSize: 416,  // Larger = more accurate (128, 224, 320, 416, 512, 608)
-          scoreThreshold: 0.4  // Lower = more sensitive (0-1)
-        });
-
         // Detect face with expressions using canvas instead of video element
         const detections = await faceapi
-          .detectSingleFace(canvas, options)
+          .detectSingleFace(canvas, DETECTOR_OPTIONS)
           .withFaceExpressions();
 
         if (detections && detections.expressions) {
           // Get the dominant emotion
           const expressions = detections.expressions;
-          const emotionEntries = Object.entries(expressions);
-
-          // Find emotion with highest confidence
-          const [dominantEmotion, confidence] = emotionEntries.reduce((max, current) =>
-            current[1] > max[1] ? current : max
-          );
+          // Find emotion with highest confidence in a single pass over the model's
+          // own labels, without building an array of [label, score] entries
+          let dominantEmotion = null;
+          let confidence = -Infinity;
+          for (const label in expressions) {
+            if (dominantEmotion === null || expressions[label] > confidence) {
+              dominantEmotion = label;
+              confidence = expressions[label];
+            }
+          }
 
           // Update state with detected emotion
           setCurrentEmotion(dominantEmotion);
@@ -147,6 +161,8 @@ export const useEmotionDetection = (videoRef, sessionActive, sessionPaused) => {
         }
       } catch (error) {
         // Silently fail - don't spam console
+      } finally {
+        detectionInFlightRef.current = false;
       }
     };
 